@@ -1,16 +1,55 @@
+import functools
 import socket
 import struct
-import random
 import os
-from io import BytesIO
+
+try:
+    # Optional (Linux only): needed just for the experimental io_uring receive path, see USE_URING.
+    # Written against liburing==2024.5.3 (pip install liburing==2024.5.3), other releases differ in API.
+    import liburing
+except ImportError:
+    liburing = None
 
 # Client protocol version
 CLIENT_VERSION = 1
 
-# DEBUG flag - if set to True it prints all sent and received bytes in hex (noisy)
+# DEBUG flag - if set to True it prints all sent and received protocol headers in hex (noisy).
+# File payloads are never dumped.
 DEBUG = False
 
-CHUNK_SIZE = 4096
+# Default size of a single socket read when streaming payloads
+CHUNK_SIZE = 64 * 1024
+
+# Size requested for the kernel socket send/receive buffers. None leaves them to the OS: setting them
+# disables Linux TCP buffer autotuning, and the kernel caps the value at net.core.rmem_max / wmem_max.
+SOCKET_BUFFER_SIZE = None
+
+# Seconds to wait for the server to accept the connection
+CONNECT_TIMEOUT = 5.0
+
+# Milliseconds sent data may remain unacknowledged before the kernel drops the connection (Linux only)
+TCP_USER_TIMEOUT_MS = 60 * 1000
+
+# Keepalive probing of an idle connection: start after KEEPALIVE_IDLE seconds, probe every
+# KEEPALIVE_INTERVAL seconds, and give up after KEEPALIVE_COUNT unanswered probes
+KEEPALIVE_IDLE = 30
+KEEPALIVE_INTERVAL = 10
+KEEPALIVE_COUNT = 3
+
+# Ask the kernel to block until a whole fixed-size field has arrived (where supported)
+RECV_FLAGS = getattr(socket, 'MSG_WAITALL', 0)
+
+# Size of the read-ahead buffer used to receive a whole response header in a single recv
+RESPONSE_BUFFER_SIZE = 4096
+
+# Experimental: receive bulk payloads with io_uring (requires the 'liburing' package), submitting
+# up to URING_QUEUE_DEPTH chunk-sized recv requests per system call
+USE_URING = False
+URING_QUEUE_DEPTH = 16
+
+# sqe.flags bits from the kernel's io_uring.h (liburing builds made with newer Cython don't export them)
+IOSQE_FIXED_FILE = 1 << 0
+IOSQE_IO_LINK = 1 << 2
 
 # Operation codes for requests
 OP_BACKUP = 100
@@ -18,6 +57,12 @@ OP_RESTORE = 200
 OP_DELETE = 201
 OP_LIST_FILES = 202
 
+# Precompiled wire formats (little-endian), so format strings are not re-parsed on every call
+REQUEST_HEADER = struct.Struct('<IBB')   # user_id, version, op
+RESPONSE_HEADER = struct.Struct('<BH')   # version, status
+UINT16 = struct.Struct('<H')             # name_len
+UINT32 = struct.Struct('<I')             # size
+
 # Status codes from server responses
 STATUS_MAP = {
     210: "SUCCESS: File restored.",
@@ -28,18 +73,85 @@ STATUS_MAP = {
     1003: "ERROR: General server error occurred."
 }
 
+@functools.lru_cache(maxsize=256)
+def _pack_file_name(filename):
+    """
+    Packs name_len and the ASCII filename. The result is cached, since the same filenames
+    are used over and over across backup, restore and delete requests.
+    """
+    filename_bytes = filename.encode('ascii')
+    # Immutable bytes, as the cached value is shared between calls
+    return UINT16.pack(len(filename_bytes)) + filename_bytes
+
+def _parse_response_header(data):
+    """
+    Parses a response header from the start of a buffer in a single pass.
+    Returns (header_len, fields), where fields is (version, status, filename, size) once the whole header
+    is in the buffer. Otherwise fields is None and header_len is the number of bytes known to be needed so far.
+    """
+    header_len = RESPONSE_HEADER.size
+    if len(data) < header_len:
+        return header_len, None
+    version, status = RESPONSE_HEADER.unpack_from(data)
+    # Only version and status are sent (1002, 1003)
+    if status in [1002, 1003]:
+        return header_len, (version, status, None, 0)
+    header_len += UINT16.size
+    if len(data) < header_len:
+        return header_len, None
+    name_len = UINT16.unpack_from(data, RESPONSE_HEADER.size)[0]
+    name_end = header_len + name_len
+    # A size field follows the filename only for responses that carry a payload (210, 211)
+    has_payload = status in [210, 211]
+    header_len = name_end + (UINT32.size if has_payload else 0)
+    if len(data) < header_len:
+        return header_len, None
+    filename = str(data[name_end - name_len:name_end], 'ascii')
+    size = UINT32.unpack_from(data, name_end)[0] if has_payload else 0
+    return header_len, (version, status, filename, size)
+
+def _traced_send(send):
+    """Wraps a send helper so that it prints the buffers it sends in hex."""
+    def traced(self, *parts):
+        print(f"  < Sent: {b''.join(parts).hex()}")
+        return send(self, *parts)
+    return traced
+
+def _traced_recv(recv):
+    """Wraps a receive helper so that it prints the bytes it returns in hex."""
+    def traced(self, length):
+        data = recv(self, length)
+        print(f"  > Received: {data.hex()}")
+        return data
+    return traced
+
 class BackupClient:
     """
     A client to interact with the backup server.
     It handles packing requests and unpacking responses according to the protocol.
     """
 
-    def __init__(self, server_info_file, backup_info_file):
+    def __init__(self, server_info_file, backup_info_file, chunk_size=CHUNK_SIZE, socket_buffer_size=SOCKET_BUFFER_SIZE):
         """Initializes the client by reading configuration files and generating a user ID."""
+        self.chunk_size = chunk_size
+        self.socket_buffer_size = socket_buffer_size
+        # Reusable receive buffer for streaming payloads, so no new bytes object is allocated per chunk
+        self._recv_buf = bytearray(chunk_size)
+        self._recv_mv = memoryview(self._recv_buf)
+        # Reusable send buffer for platforms without sendfile(2)
+        self._send_buf = bytearray(chunk_size)
+        self._send_mv = memoryview(self._send_buf)
+        # Read-ahead buffer for response headers; bytes in [_rx_start, _rx_end) were received but not yet consumed
+        self._rx_buf = bytearray(RESPONSE_BUFFER_SIZE)
+        self._rx_mv = memoryview(self._rx_buf)
+        self._rx_start = self._rx_end = 0
+        # Receive buffer for the io_uring path, allocated on first use
+        self._uring_buf = None
+        self._uring_mv = None
         self.server_ip, self.server_port = self._read_server_info(server_info_file)
         self.files_to_backup = self._read_backup_info(backup_info_file)
-        # Generate a unique 4-byte random user ID
-        self.user_id = random.randint(0, 0xFFFFFFFF)
+        # Generate a unique 4-byte random user ID (from the OS random source, so it isn't predictable)
+        self.user_id = int.from_bytes(os.urandom(4), 'little')
         self.sock = None
         print(f"Client started. User ID: {self.user_id}")
         print(f"Will connect to server at {self.server_ip}:{self.server_port}")
@@ -60,7 +172,31 @@ class BackupClient:
         """Connects to the server."""
         try:
             self.sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            if self.socket_buffer_size is not None:
+                # Fixed buffer sizes override autotuning; set them before connecting so the TCP window scale
+                # is negotiated accordingly
+                self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, self.socket_buffer_size)
+                self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, self.socket_buffer_size)
+            # Bound the connect so an unreachable server doesn't hang the client, then go back to blocking mode
+            self.sock.settimeout(CONNECT_TIMEOUT)
             self.sock.connect((self.server_ip, self.server_port))
+            self.sock.settimeout(None)
+            # Probe the idle connection (e.g. while blocked waiting for a response), so a silently dead server
+            # is detected within about a minute instead of the kernel's default of over two hours
+            self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+            for option, value in [('TCP_KEEPIDLE', KEEPALIVE_IDLE), ('TCP_KEEPINTVL', KEEPALIVE_INTERVAL), ('TCP_KEEPCNT', KEEPALIVE_COUNT)]:
+                try:
+                    self.sock.setsockopt(socket.IPPROTO_TCP, getattr(socket, option), value)
+                except (AttributeError, OSError):
+                    pass
+            # The protocol exchanges many tiny headers, so disable Nagle's algorithm
+            # to avoid waiting on delayed ACKs before each one is sent.
+            self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            try:
+                # Linux only: cap how long sent data may stay unacknowledged by an unresponsive peer.
+                self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_USER_TIMEOUT, TCP_USER_TIMEOUT_MS)
+            except (AttributeError, OSError):
+                pass
             print("Successfully connected to the server.")
             return True
         except socket.error as e:
@@ -72,86 +208,251 @@ class BackupClient:
         if self.sock:
             self.sock.close()
             self.sock = None
+            self._rx_start = self._rx_end = 0
             print("Connection closed.")
 
     def _send_all(self, data):
         """Helper to ensure all data is sent over the socket."""
-        if DEBUG:
-            print(f"  < Sent: {data.hex()}")
         self.sock.sendall(data)
 
+    def _send_parts(self, *parts):
+        """Sends several buffers as one gathered write (writev), without concatenating them first."""
+        if not hasattr(self.sock, 'sendmsg'):
+            # sendmsg is not available on Windows
+            self.sock.sendall(b''.join(parts))
+            return
+        buffers = [memoryview(part) for part in parts]
+        while buffers:
+            bytes_sent = self.sock.sendmsg(buffers)
+            # Drop whatever was fully sent and resume from the middle of a partially sent buffer
+            while buffers and bytes_sent >= len(buffers[0]):
+                bytes_sent -= len(buffers.pop(0))
+            if bytes_sent:
+                buffers[0] = buffers[0][bytes_sent:]
+
+    def _send_file(self, file_handle, size):
+        """Sends size bytes of file content from the start of the file and returns how many were sent."""
+        if not size:
+            # Nothing to send for an empty file (socket.sendfile rejects count=0)
+            return 0
+        if hasattr(os, 'sendfile'):
+            # Zero-copy: the kernel moves the pages from the page cache straight into the socket.
+            # This already avoids the user-to-kernel copy that MSG_ZEROCOPY targets, without having to pin
+            # a user buffer and reap completion notifications from the socket's error queue.
+            return self.sock.sendfile(file_handle, offset=0, count=size)
+        # socket.sendfile's own fallback allocates a new bytes object per block, so read into a reusable buffer instead
+        bytes_sent = 0
+        while bytes_sent < size:
+            bytes_read = file_handle.readinto(self._send_mv[:min(size - bytes_sent, self.chunk_size)])
+            if not bytes_read:
+                break
+            self.sock.sendall(self._send_mv[:bytes_read])
+            bytes_sent += bytes_read
+        return bytes_sent
+
+    def _top_up_read_ahead(self):
+        """Moves unconsumed bytes to the front of the read-ahead buffer and receives whatever else has arrived after them."""
+        pending = self._rx_end - self._rx_start
+        if self._rx_start:
+            self._rx_buf[:pending] = self._rx_buf[self._rx_start:self._rx_end]
+            self._rx_start, self._rx_end = 0, pending
+        bytes_recd = self.sock.recv_into(self._rx_mv[pending:])
+        if not bytes_recd:
+            raise RuntimeError("Socket connection broken")
+        self._rx_end += bytes_recd
+
+    def _take_read_ahead(self, max_len):
+        """Consumes up to max_len bytes from the read-ahead buffer and returns them as a view (no copy)."""
+        end = min(self._rx_start + max_len, self._rx_end)
+        view = self._rx_mv[self._rx_start:end]
+        self._rx_start = end
+        return view
+
+    def _recv_field(self, length):
+        """Returns the next length bytes of a response, straight from the read-ahead buffer when possible."""
+        if self._rx_end - self._rx_start >= length:
+            return self._take_read_ahead(length)
+        return self._recv_all(length)
+
     def _recv_all(self, length):
-        """Helper to ensure all expected data is received from the socket."""
-        chunks = []
-        bytes_recd = 0
+        """Helper to ensure all expected data is received from the socket. Returns a memoryview over the data."""
+        # Receive straight into a single pre-sized buffer instead of joining chunks
+        view = memoryview(bytearray(length))
+        self._recv_into(view)
+        # A view is enough for the callers (struct unpacking, str()), so never copy into a new bytes object
+        return view
+
+    def _recv_into(self, view):
+        """Fills the given writable buffer view completely with data received from the socket."""
+        length = len(view)
+        # Start with anything already sitting in the read-ahead buffer
+        buffered = self._take_read_ahead(length)
+        bytes_recd = len(buffered)
+        view[:bytes_recd] = buffered
         while bytes_recd < length:
-            chunk = self.sock.recv(min(length - bytes_recd, CHUNK_SIZE))
-            if not chunk:
+            # With MSG_WAITALL this normally completes in one call; the loop covers short reads (e.g. signals)
+            chunk_len = self.sock.recv_into(view[bytes_recd:], length - bytes_recd, RECV_FLAGS)
+            if not chunk_len:
                 raise RuntimeError("Socket connection broken")
-            chunks.append(chunk)
-            bytes_recd += len(chunk)
-        return b''.join(chunks)
+            bytes_recd += chunk_len
 
     def _read_payload_in_chunks(self, size, file_handle):
         """Reads a payload of a given size in chunks and writes it to a file handle."""
-        remaining_bytes = size
+        # Part of the payload may already have arrived together with the response header
+        buffered = self._take_read_ahead(size)
+        if buffered:
+            file_handle.write(buffered)
+        remaining_bytes = size - len(buffered)
+        if remaining_bytes > 0 and USE_URING and liburing is not None:
+            remaining_bytes -= self._recv_payload_uring(remaining_bytes, file_handle)
+        if remaining_bytes > 0 and hasattr(os, 'splice'):
+            remaining_bytes -= self._splice_to_file(remaining_bytes, file_handle)
         while remaining_bytes > 0:
-            chunk = self.sock.recv(min(remaining_bytes, CHUNK_SIZE))
-            if not chunk:
+            bytes_recd = self.sock.recv_into(self._recv_mv[:min(remaining_bytes, self.chunk_size)])
+            if not bytes_recd:
                 raise RuntimeError("Socket connection broken")
-            file_handle.write(chunk)
-            remaining_bytes -= len(chunk)
+            file_handle.write(self._recv_mv[:bytes_recd])
+            remaining_bytes -= bytes_recd
+
+    def _recv_payload_uring(self, size, file_handle):
+        """
+        Receives size bytes of payload with io_uring and writes them to a file handle.
+        Each batch submits up to URING_QUEUE_DEPTH linked recv requests with a single system call,
+        instead of one recv call per chunk. Returns the number of bytes received, which is 0 if io_uring
+        can't be set up (e.g. blocked by seccomp or kernel.io_uring_disabled).
+        """
+        if self._uring_buf is None:
+            # One contiguous buffer holds a whole batch, so it can be written to the file in one call
+            self._uring_buf = bytearray(URING_QUEUE_DEPTH * self.chunk_size)
+            self._uring_mv = memoryview(self._uring_buf)
+        # This prototype sets up the ring and registers the socket for every payload. That costs a few
+        # system calls per restore, which is small next to the bulk transfers this path is meant for.
+        # Setup failures fall back to splice / recv_into, since nothing was consumed yet. Besides OSError this
+        # also covers a liburing release whose API differs from the pinned one (AttributeError / TypeError).
+        try:
+            ring = liburing.io_uring()
+            cqe = liburing.io_uring_cqe()
+            liburing.io_uring_queue_init(URING_QUEUE_DEPTH, ring)
+        except (OSError, AttributeError, TypeError):
+            return 0
+        try:
+            # Register the socket, so the kernel doesn't look up the descriptor for every request
+            try:
+                liburing.io_uring_register_files(ring, [self.sock.fileno()])
+            except (OSError, AttributeError, TypeError):
+                return 0
+            remaining_bytes = size
+            while remaining_bytes > 0:
+                batch_len = min(remaining_bytes, URING_QUEUE_DEPTH * self.chunk_size)
+                chunk_count = 0
+                for offset in range(0, batch_len, self.chunk_size):
+                    chunk_len = min(batch_len - offset, self.chunk_size)
+                    sqe = liburing.io_uring_get_sqe(ring)
+                    # MSG_WAITALL fills each chunk completely, and linking keeps the requests in stream order
+                    liburing.io_uring_prep_recv(sqe, 0, self._uring_mv[offset:offset + chunk_len], chunk_len, RECV_FLAGS)
+                    sqe.flags |= IOSQE_FIXED_FILE
+                    if offset + chunk_len < batch_len:
+                        sqe.flags |= IOSQE_IO_LINK
+                    liburing.io_uring_sqe_set_data64(sqe, chunk_count)
+                    chunk_count += 1
+                liburing.io_uring_submit_and_wait(ring, chunk_count)
+
+                # Completions may arrive in any order; user_data holds the chunk index
+                results = [0] * chunk_count
+                for _ in range(chunk_count):
+                    error = liburing.io_uring_wait_cqe(ring, cqe)
+                    if error < 0:
+                        raise OSError(-error, os.strerror(-error))
+                    results[cqe.user_data] = cqe.res
+                    liburing.io_uring_cqe_seen(ring, cqe)
+
+                for index, result in enumerate(results):
+                    if result < 0:
+                        raise OSError(-result, os.strerror(-result))
+                    if result != min(batch_len - index * self.chunk_size, self.chunk_size):
+                        raise RuntimeError("Socket connection broken")
+                file_handle.write(self._uring_mv[:batch_len])
+                remaining_bytes -= batch_len
+        finally:
+            liburing.io_uring_queue_exit(ring)
+        return size
+
+    def _splice_to_file(self, size, file_handle):
+        """
+        Moves up to size bytes from the socket into a file without copying them through user space,
+        using Linux splice(2) via an intermediate pipe (splice requires one end to be a pipe).
+        Returns the number of bytes moved, which is 0 if the target can't be spliced into (e.g. an in-memory buffer).
+        """
+        try:
+            file_fd = file_handle.fileno()
+        except (AttributeError, OSError):
+            return 0
+        # Anything the file object buffered must reach the file before the kernel appends to it
+        file_handle.flush()
+        pipe_r, pipe_w = os.pipe()
+        bytes_moved = 0
+        try:
+            while bytes_moved < size:
+                try:
+                    in_pipe = os.splice(self.sock.fileno(), pipe_w, min(size - bytes_moved, self.chunk_size))
+                except OSError:
+                    if bytes_moved:
+                        raise
+                    # splice isn't supported here; nothing was consumed, so the caller can fall back to recv_into
+                    return 0
+                if not in_pipe:
+                    raise RuntimeError("Socket connection broken")
+                while in_pipe > 0:
+                    written = os.splice(pipe_r, file_fd, in_pipe)
+                    in_pipe -= written
+                    bytes_moved += written
+        finally:
+            os.close(pipe_r)
+            os.close(pipe_w)
+        return bytes_moved
 
     def _read_response(self):
         """Reads and parses a response from the server."""
-        # Read the fixed-size part of the header
-        header_part1 = self._recv_all(3)  # version (1) + status (2)
-        if DEBUG:
-            print(f"  > Received: {header_part1.hex()}")
-        version, status = struct.unpack('<BH', header_part1)
+        # Typically a single recv brings in the whole header (and possibly the start of the payload)
+        while True:
+            header_len, fields = _parse_response_header(self._rx_mv[self._rx_start:self._rx_end])
+            if fields is not None or header_len > RESPONSE_BUFFER_SIZE:
+                break
+            self._top_up_read_ahead()
+
+        # Consume the header from the read-ahead buffer. A header that doesn't fit in it
+        # (a very long filename) is completed straight from the socket and parsed from there.
+        header = self._recv_field(header_len)
+        if fields is None:
+            _, fields = _parse_response_header(header)
+        version, status, filename, size = fields
 
         print(f"  > Received response: Version={version}, Status={status} ({STATUS_MAP.get(status, 'Unknown')})")
-
-        # Case 1: Only version and status are sent (1002, 1003)
-        if status in [1002, 1003]:
-            return status, None, 0
-
-        # Case 2: Full header (version, status, name_len, filename) is sent (212, 1001)
-        # and also for 210, 211 which have full header + body
-        name_len_data = self._recv_all(2)
-        if DEBUG:
-            print(f"  > Received: {name_len_data.hex()}")
-        name_len = struct.unpack('<H', name_len_data)[0]
-
-        filename_bytes = self._recv_all(name_len)
-        if DEBUG:
-            print(f"  > Received: {filename_bytes.hex()}")
-        filename = filename_bytes.decode('ascii')
-        print(f"  > Response Filename: {filename}")
-
-        # Case 3: Full header + body (size, payload) is sent (210, 211)
+        if filename is not None:
+            print(f"  > Response Filename: {filename}")
         if status in [210, 211]:
-            size_data = self._recv_all(4)
-            if DEBUG:
-                print(f"  > Received: {size_data.hex()}")
-            size = struct.unpack('<I', size_data)[0]
             print(f"  > Response Payload Size: {size} bytes")
-            return status, filename, size
-        else: # This covers 212, 1001 where only full header is sent
-            return status, filename, 0
-
+        return status, filename, size
 
     def request_list_files(self):
         """Sends a request to list files on the server."""
         print("\n[Action] Requesting file list...")
+        self._send_list_request()
+        return self._receive_list_response()
+
+    def _send_list_request(self):
+        """Sends the LIST_FILES request."""
         # Header: user_id, version, op
-        header = struct.pack('<IBB', self.user_id, CLIENT_VERSION, OP_LIST_FILES)
+        header = REQUEST_HEADER.pack(self.user_id, CLIENT_VERSION, OP_LIST_FILES)
         self._send_all(header)
+
+    def _receive_list_response(self):
+        """Reads the response to a LIST_FILES request and prints the file list."""
         status, _, payload_size = self._read_response()
         if payload_size > 0:
-            payload_buffer = BytesIO()
-            self._read_payload_in_chunks(payload_size, payload_buffer)
-            payload = payload_buffer.getvalue()
+            # Receive the list straight into one buffer of the announced size, then decode it in place
+            payload = bytearray(payload_size)
+            self._recv_into(memoryview(payload))
             print("--- Server File List ---")
             print(payload.decode('ascii').strip())
             print("------------------------")
@@ -165,36 +466,38 @@ class BackupClient:
             return None
 
         file_size = os.path.getsize(filename)
-        filename_bytes = filename.encode('ascii')
         
         # Header: user_id, version, op
-        header = struct.pack('<IBB', self.user_id, CLIENT_VERSION, OP_BACKUP)
+        header = REQUEST_HEADER.pack(self.user_id, CLIENT_VERSION, OP_BACKUP)
         # File info: name_len, filename, size
-        file_info = struct.pack(f'<H{len(filename_bytes)}sI', len(filename_bytes), filename_bytes, file_size)
-        
-        self._send_all(header + file_info)
-
-        with open(filename, 'rb') as f:
-            while True:
-                chunk = f.read(CHUNK_SIZE)
-                if not chunk:
-                    break
-                self._send_all(chunk)
-        
+        self._send_parts(header, _pack_file_name(filename), UINT32.pack(file_size))
+
+        # Send exactly the size announced in the header, even if the file grows meanwhile.
+        # The file is opened unbuffered: sendfile bypasses Python's buffering anyway, and without sendfile
+        # each readinto then maps to a single read straight into the send buffer.
+        with open(filename, 'rb', buffering=0) as f:
+            bytes_sent = self._send_file(f, file_size)
+        if bytes_sent != file_size:
+            raise RuntimeError(f"File '{filename}' shrank while it was being sent")
+
         status, _, _ = self._read_response()
         return status
         
     def request_restore_file(self, filename):
         """Sends a request to restore a file."""
         print(f"\n[Action] Restoring file: '{filename}'...")
-        filename_bytes = filename.encode('ascii')
-        
+        self._send_restore_request(filename)
+        return self._receive_restore_response()
+
+    def _send_restore_request(self, filename):
+        """Sends the RESTORE request for a file."""
         # Header: user_id, version, op
-        header = struct.pack('<IBB', self.user_id, CLIENT_VERSION, OP_RESTORE)
+        header = REQUEST_HEADER.pack(self.user_id, CLIENT_VERSION, OP_RESTORE)
         # File info: name_len, filename
-        file_info = struct.pack(f'<H{len(filename_bytes)}s', len(filename_bytes), filename_bytes)
-        
-        self._send_all(header + file_info)
+        self._send_parts(header, _pack_file_name(filename))
+
+    def _receive_restore_response(self):
+        """Reads the response to a RESTORE request and saves the restored file."""
         status, response_filename, payload_size = self._read_response()
         
         # Note: seems there's a conflict in the spec about the filename in the response to RESTORE.
@@ -220,17 +523,61 @@ class BackupClient:
     def request_delete_file(self, filename):
         """Sends a request to delete a file."""
         print(f"\n[Action] Deleting file: '{filename}'...")
-        filename_bytes = filename.encode('ascii')
+        self._send_delete_request(filename)
+        return self._receive_delete_response()
 
+    def _send_delete_request(self, filename):
+        """Sends the DELETE request for a file."""
         # Header: user_id, version, op
-        header = struct.pack('<IBB', self.user_id, CLIENT_VERSION, OP_DELETE)
+        header = REQUEST_HEADER.pack(self.user_id, CLIENT_VERSION, OP_DELETE)
         # File info: name_len, filename
-        file_info = struct.pack(f'<H{len(filename_bytes)}s', len(filename_bytes), filename_bytes)
-        
-        self._send_all(header + file_info)
+        self._send_parts(header, _pack_file_name(filename))
+
+    def _receive_delete_response(self):
+        """Reads the response to a DELETE request."""
         status, _, _ = self._read_response()
         return status
 
+    def pipeline(self, requests):
+        """
+        Sends several header-only requests back-to-back and only then reads their responses,
+        so the round trips overlap instead of each request waiting for the previous response.
+        requests is a list of (op, filename) tuples, where op is OP_LIST_FILES (filename None), OP_RESTORE or OP_DELETE.
+        The server handles the requests of a connection in order, so the responses arrive in the same order.
+        Backups are not supported: sending a large file while the server writes (possibly large) responses
+        that are not being read yet could stall both sides.
+        Returns the list of response statuses.
+        """
+        receivers = []
+        for op, filename in requests:
+            if op == OP_LIST_FILES:
+                print("\n[Action] Requesting file list (pipelined)...")
+                self._send_list_request()
+                receivers.append(self._receive_list_response)
+            elif op == OP_RESTORE:
+                print(f"\n[Action] Restoring file: '{filename}' (pipelined)...")
+                self._send_restore_request(filename)
+                receivers.append(self._receive_restore_response)
+            elif op == OP_DELETE:
+                print(f"\n[Action] Deleting file: '{filename}' (pipelined)...")
+                self._send_delete_request(filename)
+                receivers.append(self._receive_delete_response)
+            else:
+                raise ValueError(f"Operation {op} can't be pipelined")
+
+        statuses = []
+        for index, receive in enumerate(receivers, 1):
+            print(f"\n[Response {index}/{len(receivers)}]")
+            statuses.append(receive())
+        return statuses
+
+    if DEBUG:
+        # Bind tracing variants only when debugging, so the normal send/receive paths carry no debug checks.
+        # Only header-sized buffers pass through these helpers; payloads use sendfile / the chunked readers.
+        _send_all = _traced_send(_send_all)
+        _send_parts = _traced_send(_send_parts)
+        _recv_field = _traced_recv(_recv_field)
+
 def main():
     """
     Main function to run the client's operational flow.
@@ -256,20 +603,16 @@ def main():
         else:
             print("No second file listed in backup.info to back up.")
 
+        # Steps 7-10 only send small requests, so pipeline them: send all of them first, then read the responses.
         # Step 7: Request file list again (should now show the backed-up files)
-        client.request_list_files()
-
-        # Step 8: Request to restore the first file
-        if len(client.files_to_backup) > 0:
-            client.request_restore_file(client.files_to_backup[0])
-
-        # Step 9: Request to delete the first file
-        if len(client.files_to_backup) > 0:
-            client.request_delete_file(client.files_to_backup[0])
-        
-        # Step 10: Request to restore the first file again (should fail)
+        requests = [(OP_LIST_FILES, None)]
         if len(client.files_to_backup) > 0:
-            client.request_restore_file(client.files_to_backup[0])
+            requests += [
+                (OP_RESTORE, client.files_to_backup[0]),  # Step 8: Request to restore the first file
+                (OP_DELETE, client.files_to_backup[0]),   # Step 9: Request to delete the first file
+                (OP_RESTORE, client.files_to_backup[0]),  # Step 10: Request to restore the first file again (should fail)
+            ]
+        client.pipeline(requests)
 
     except Exception as e:
         print(f"\nAn unexpected error occurred: {e}")
@@ -0,0 +1,174 @@
+import io
+import os
+import socket
+import sys
+import tempfile
+import threading
+import types
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import client  # noqa: E402
+
+CHUNK_SIZE = 1024
+QUEUE_DEPTH = 4
+
+
+class _Sqe:
+    def __init__(self):
+        self.flags = 0
+        self.fd = None
+        self.buf = None
+        self.length = None
+        self.recv_flags = None
+        self.user_data = None
+
+
+class _Cqe:
+    def __init__(self):
+        self.user_data = None
+        self.res = None
+
+
+def make_stub_liburing(sock, fail_on=None):
+    """
+    Builds a stand-in for the liburing==2024.5.3 module that records every call and performs the recv
+    requests against the registered socket, completing them in reverse order to exercise user_data.
+    """
+    stub = types.ModuleType('liburing')
+    stub.calls = []
+    stub.batches = []
+    state = {'files': None, 'pending': [], 'completions': []}
+
+    def record(name, *args):
+        stub.calls.append((name,) + args)
+        if name == fail_on:
+            raise OSError(38, 'Function not implemented')
+
+    def io_uring():
+        record('io_uring')
+        return object()
+
+    def io_uring_cqe():
+        record('io_uring_cqe')
+        return _Cqe()
+
+    def io_uring_queue_init(entries, ring):
+        record('io_uring_queue_init', entries)
+
+    def io_uring_register_files(ring, fds):
+        record('io_uring_register_files', list(fds))
+        state['files'] = list(fds)
+
+    def io_uring_get_sqe(ring):
+        record('io_uring_get_sqe')
+        sqe = _Sqe()
+        state['pending'].append(sqe)
+        return sqe
+
+    def io_uring_prep_recv(sqe, sockfd, buf, length, flags=0):
+        record('io_uring_prep_recv', sockfd, len(buf), length, flags)
+        sqe.fd, sqe.buf, sqe.length, sqe.recv_flags = sockfd, buf, length, flags
+
+    def io_uring_sqe_set_data64(sqe, data):
+        sqe.user_data = data
+
+    def io_uring_submit_and_wait(ring, wait_nr):
+        record('io_uring_submit_and_wait', wait_nr)
+        batch, state['pending'] = state['pending'], []
+        stub.batches.append(batch)
+        completions = []
+        for sqe in batch:
+            assert sqe.flags & client.IOSQE_FIXED_FILE
+            fd = state['files'][sqe.fd]
+            assert fd == sock.fileno()
+            completions.append((sqe.user_data, sock.recv_into(sqe.buf, sqe.length, sqe.recv_flags)))
+        state['completions'] = list(reversed(completions))
+        return len(batch)
+
+    def io_uring_wait_cqe(ring, cqe):
+        cqe.user_data, cqe.res = state['completions'].pop(0)
+        return 0
+
+    def io_uring_cqe_seen(ring, cqe):
+        pass
+
+    def io_uring_queue_exit(ring):
+        record('io_uring_queue_exit')
+
+    for function in (io_uring, io_uring_cqe, io_uring_queue_init, io_uring_register_files, io_uring_get_sqe,
+                     io_uring_prep_recv, io_uring_sqe_set_data64, io_uring_submit_and_wait, io_uring_wait_cqe,
+                     io_uring_cqe_seen, io_uring_queue_exit):
+        setattr(stub, function.__name__, function)
+    return stub
+
+
+class UringReceiveTest(unittest.TestCase):
+    def setUp(self):
+        self.client_sock, self.server_sock = socket.socketpair()
+        with tempfile.TemporaryDirectory() as config_dir:
+            server_info = os.path.join(config_dir, 'server.info')
+            backup_info = os.path.join(config_dir, 'backup.info')
+            with open(server_info, 'w') as f:
+                f.write('127.0.0.1:1256')
+            with open(backup_info, 'w') as f:
+                f.write('')
+            self.backup_client = client.BackupClient(server_info, backup_info, chunk_size=CHUNK_SIZE)
+        self.backup_client.sock = self.client_sock
+        self.saved = (client.liburing, client.USE_URING, client.URING_QUEUE_DEPTH)
+        client.USE_URING = True
+        client.URING_QUEUE_DEPTH = QUEUE_DEPTH
+
+    def tearDown(self):
+        client.liburing, client.USE_URING, client.URING_QUEUE_DEPTH = self.saved
+        self.client_sock.close()
+        self.server_sock.close()
+
+    def receive(self, payload):
+        sender = threading.Thread(target=self.server_sock.sendall, args=(payload,))
+        sender.start()
+        file_handle = io.BytesIO()
+        self.backup_client._read_payload_in_chunks(len(payload), file_handle)
+        sender.join()
+        return file_handle.getvalue()
+
+    def test_linked_batches_and_short_final_chunk(self):
+        stub = client.liburing = make_stub_liburing(self.client_sock)
+        # Two full batches plus a short final chunk in a third batch
+        payload = os.urandom(2 * QUEUE_DEPTH * CHUNK_SIZE + 100)
+        self.assertEqual(self.receive(payload), payload)
+
+        self.assertIn(('io_uring_queue_init', QUEUE_DEPTH), stub.calls)
+        self.assertIn(('io_uring_register_files', [self.client_sock.fileno()]), stub.calls)
+        prep_calls = [call for call in stub.calls if call[0] == 'io_uring_prep_recv']
+        self.assertEqual(prep_calls, [('io_uring_prep_recv', 0, CHUNK_SIZE, CHUNK_SIZE, client.RECV_FLAGS)] *
+                         (2 * QUEUE_DEPTH) + [('io_uring_prep_recv', 0, 100, 100, client.RECV_FLAGS)])
+        self.assertEqual([len(batch) for batch in stub.batches], [QUEUE_DEPTH, QUEUE_DEPTH, 1])
+        for batch in stub.batches:
+            self.assertEqual([sqe.user_data for sqe in batch], list(range(len(batch))))
+            self.assertTrue(all(sqe.flags & client.IOSQE_IO_LINK for sqe in batch[:-1]))
+            self.assertFalse(batch[-1].flags & client.IOSQE_IO_LINK)
+        self.assertEqual(stub.calls[-1], ('io_uring_queue_exit',))
+
+    def test_falls_back_when_ring_setup_fails(self):
+        stub = client.liburing = make_stub_liburing(self.client_sock, fail_on='io_uring_queue_init')
+        payload = os.urandom(3 * CHUNK_SIZE + 7)
+        self.assertEqual(self.receive(payload), payload)
+        self.assertNotIn(('io_uring_queue_exit',), stub.calls)
+
+    def test_falls_back_when_registration_fails(self):
+        stub = client.liburing = make_stub_liburing(self.client_sock, fail_on='io_uring_register_files')
+        payload = os.urandom(3 * CHUNK_SIZE + 7)
+        self.assertEqual(self.receive(payload), payload)
+        self.assertEqual(stub.calls[-1], ('io_uring_queue_exit',))
+
+    def test_falls_back_on_liburing_api_mismatch(self):
+        # e.g. a liburing release without the io_uring / io_uring_cqe classes
+        client.liburing = types.ModuleType('liburing')
+        payload = os.urandom(3 * CHUNK_SIZE + 7)
+        self.assertEqual(self.receive(payload), payload)
+
+
+if __name__ == '__main__':
+    unittest.main()